@@ -12,7 +12,9 @@ from .rules import (
     AircraftCapabilityRules,
     TaskCharacteristicRules,
     GeographicalConstraintRules,
-    EfficiencyOptimizationRules
+    EfficiencyOptimizationRules,
+    OccupiedRegistry,
+    ThreatRegistry
 )
 
 __all__ = [
@@ -24,5 +26,7 @@ __all__ = [
     "AircraftCapabilityRules",
     "TaskCharacteristicRules",
     "GeographicalConstraintRules",
-    "EfficiencyOptimizationRules"
+    "EfficiencyOptimizationRules",
+    "OccupiedRegistry",
+    "ThreatRegistry"
 ]
\ No newline at end of file
@@ -1,7 +1,260 @@
-from typing import List, Tuple, Dict, Set, Optional, Any
+from typing import List, Dict, Any
 import copy
+import logging
+import math
+from array import array
+from bisect import bisect_left, bisect_right, insort
 from collections import defaultdict
 
+import numpy as np
+
+try:
+    from geopy.distance import geodesic
+except ImportError:
+    geodesic = None
+
+try:
+    from pyproj import Geod
+    _GEOD = Geod(ellps='WGS84')
+except ImportError:
+    _GEOD = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+logger = logging.getLogger(__name__)
+
+# 武器（打击类）载荷类型，需要额外检查武器库存
+_WEAPON_KEYS = frozenset({1})
+
+_INF = float('inf')
+
+# 地球平均半径（米），用于haversine距离计算
+_EARTH_RADIUS_M = 6371008.8
+
+# 已占用阵位/威胁数量达到该值时，改用KDTree近邻查询代替线性扫描
+_KDTREE_MIN_POINTS = 64
+
+# 阵位间距惩罚：距最近已占用阵位 _OCCUPIED_BUFFER_M 内线性惩罚（最大 _OCCUPIED_PENALTY），
+# _OCCUPIED_CRITICAL_M 内再加极重惩罚 _OCCUPIED_CRITICAL_PENALTY
+_OCCUPIED_BUFFER_M = 20000.0
+_OCCUPIED_CRITICAL_M = 5000.0
+_OCCUPIED_PENALTY = 50000.0
+_OCCUPIED_CRITICAL_PENALTY = 100000.0
+
+# 以普通列表传入的已占用阵位不超过该值时，position_scoring 不构建 OccupiedRegistry，
+# 直接用纯Python等距圆柱近似计算最小距离，省去数组构建与NumPy调用开销（20km惩罚带内近似误差远小于0.1%）
+_EQUIRECT_MAX_POINTS = 16
+
+# is_safe_batch / score_positions 每块处理的候选阵位数，限制 (候选 × 威胁/已占用阵位) 矩阵的内存占用
+_SAFETY_BATCH_ROWS = 10000
+
+# 球面距离相对椭球面距离的误差余量，用于威胁候选筛选半径放大
+_SPHERE_MARGIN = 1.01
+
+# 任务数量达到该值时，sort_tasks_by_weight 使用向量化批量权重计算
+_BATCH_SORT_THRESHOLD = 1000
+
+
+# 延迟导入的 SolutionChecker 类，首次导入成功后缓存
+_solution_checker_cls = None
+
+
+def _get_solution_checker():
+    """
+    获取 SolutionChecker 类（延迟导入）
+
+    solution_checker 可能反向导入本模块，因此不在模块加载时导入；首次导入成功后缓存，
+    导入失败返回None，下次调用时重试。
+    """
+    global _solution_checker_cls
+    if _solution_checker_cls is None:
+        try:
+            from solution_checker import SolutionChecker
+        except ImportError:
+            return None
+        _solution_checker_cls = SolutionChecker
+    return _solution_checker_cls
+
+
+# 延迟导入的 base_functions 函数，按名称缓存首次导入成功的结果
+_base_functions = {}
+
+
+def _get_base_functions(*names):
+    """
+    获取 base_functions 模块中的函数（延迟导入）
+
+    与 SolutionChecker 相同，base_functions 为调用方提供的同级模块，不在模块加载时导入；
+    全部函数导入成功后缓存，任一函数导入失败返回None，下次调用时重试。
+
+    Returns:
+        tuple: 与 names 顺序一致的函数元组，导入失败时为None
+    """
+    if not all(name in _base_functions for name in names):
+        try:
+            import base_functions
+            funcs = [getattr(base_functions, name) for name in names]
+        except (ImportError, AttributeError):
+            return None
+        _base_functions.update(zip(names, funcs))
+    return tuple(_base_functions[name] for name in names)
+
+
+def _jit(**options):
+    """numba可用时以 njit 编译被装饰函数，否则保留原NumPy实现"""
+    def decorator(func):
+        return njit(**options)(func) if njit is not None else func
+    return decorator
+
+
+@_jit(cache=True, nogil=True)
+def _count_overlaps_batch(starts, ends, window_starts, window_ends):
+    """
+    批量统计各时间窗口与跑道占用的重叠数量（starts、ends 为升序数组）
+
+    重叠数 = #(start < window_end) - #(end <= window_start)，参见 _count_overlaps；
+    仅对时长为正的时间窗口成立。
+    """
+    return (np.searchsorted(starts, window_ends, side='left') -
+            np.searchsorted(ends, window_starts, side='right'))
+
+
+def _haversine_rad(lat0, lon0, lats, lons):
+    """
+    计算点 (lat0, lon0) 到一组点的大圆距离（米，haversine公式，向量化，输入为弧度）
+
+    Args:
+        lat0, lon0: 起点纬度、经度（弧度）
+        lats, lons: 终点纬度、经度数组（弧度）
+
+    Returns:
+        np.ndarray: 距离数组（米）
+    """
+    dlat = lats - lat0
+    dlon = lons - lon0
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat0) * np.cos(lats) * np.sin(dlon / 2) ** 2
+    return 2 * _EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+
+if njit is not None:
+    @njit(fastmath=True, cache=True)
+    def _min_haversine_rad(lat0, lon0, lats, lons):
+        """
+        计算点 (lat0, lon0) 到一组点的最小大圆距离（米，输入为弧度）
+
+        单次循环逐点计算haversine中间量a并记录最小值，不产生中间数组；
+        距离随a单调递增，只对最小的a计算一次 asin/sqrt。
+        a 的取值上限为1（对跖点），以有限值1.0作为初值，避免 fastmath 下对无穷大的比较未定义。
+        """
+        cos_lat0 = math.cos(lat0)
+        min_a = 1.0
+        for i in range(lats.shape[0]):
+            sin_dlat = math.sin((lats[i] - lat0) * 0.5)
+            sin_dlon = math.sin((lons[i] - lon0) * 0.5)
+            a = sin_dlat * sin_dlat + cos_lat0 * math.cos(lats[i]) * sin_dlon * sin_dlon
+            if a < min_a:
+                min_a = a
+        return 2.0 * _EARTH_RADIUS_M * math.asin(math.sqrt(min_a))
+else:
+    _min_haversine_rad = None
+
+
+def _unit_vectors(lats, lons):
+    """
+    将弧度经纬度转换为单位球面上的地心直角坐标（ECEF方向向量）
+
+    Returns:
+        np.ndarray: 形状为 (..., 3) 的 (x, y, z) 坐标
+    """
+    cos_lat = np.cos(lats)
+    return np.stack((cos_lat * np.cos(lons), cos_lat * np.sin(lons), np.sin(lats)), axis=-1)
+
+
+@_jit(cache=True)
+def _penalty_from_mindist(d):
+    """
+    按最近已占用阵位距离（米）计算阵位间距惩罚（标量）
+    """
+    if d < _OCCUPIED_BUFFER_M:
+        penalty = (_OCCUPIED_BUFFER_M - d) / _OCCUPIED_BUFFER_M * _OCCUPIED_PENALTY
+        if d < _OCCUPIED_CRITICAL_M:
+            penalty += _OCCUPIED_CRITICAL_PENALTY
+        return penalty
+    return 0.0
+
+
+def _dot_to_distance(dots):
+    """
+    单位向量点积转换为大圆距离（米）：d = 2R·arcsin(sqrt((1 - dot) / 2))
+    """
+    return 2 * _EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(0.5 * (1 - dots), 0.0, 1.0)))
+
+
+def _chord_to_distance(chord):
+    """
+    地心直角坐标下的弦长（米）转换为大圆距离（米）
+    """
+    return 2 * _EARTH_RADIUS_M * np.arcsin(np.minimum(np.asarray(chord) / (2 * _EARTH_RADIUS_M), 1.0))
+
+
+def _distance_to_chord(distance):
+    """
+    大圆距离（米）转换为地心直角坐标下的弦长（米）
+    """
+    return 2 * _EARTH_RADIUS_M * math.sin(min(distance / (2 * _EARTH_RADIUS_M), math.pi / 2))
+
+
+def _geod_distance(lons1, lats1, lons2, lats2):
+    """
+    WGS84椭球面大地线距离（米，pyproj向量化计算，输入为度，支持广播）
+    """
+    lons1, lats1, lons2, lats2 = np.broadcast_arrays(
+        *(np.asarray(x, dtype=np.float64) for x in (lons1, lats1, lons2, lats2))
+    )
+    _, _, distance = _GEOD.inv(lons1.ravel(), lats1.ravel(), lons2.ravel(), lats2.ravel())
+    return np.asarray(distance).reshape(lons1.shape)
+
+
+def _as_point_array(points_geo):
+    """
+    将坐标序列 [(lon, lat, ...), ...] 转换为形状为 (N, k) 的float64数组，空序列返回 (0, 2)
+    """
+    points = np.asarray(points_geo, dtype=np.float64)
+    return points.reshape(len(points), -1) if points.size else points.reshape(0, 2)
+
+
+def _as_registry(points_geo, registry_cls):
+    """
+    获取坐标注册表：points_geo 已是 registry_cls 实例时直接使用（缓存由注册表维护），
+    否则每次调用构建临时注册表，保证普通列表被原地修改后结果仍然正确
+    """
+    if isinstance(points_geo, registry_cls):
+        return points_geo
+    return registry_cls(points_geo)
+
+
+def _set_cache_attr(obj, name, value):
+    """在对象上缓存计算结果；对象不支持动态属性（如 __slots__）时不缓存"""
+    try:
+        setattr(obj, name, value)
+    except AttributeError:
+        pass
+
+
+def _wrap_lon(lons):
+    """
+    将弧度经度（标量或数组）归一化到 [-π, π)
+    """
+    return (lons + math.pi) % (2 * math.pi) - math.pi
+
 
 class AirportCapabilityRules:
     """
@@ -35,12 +288,12 @@ class AirportCapabilityRules:
             is_open = True
             status_source = "默认值"
 
-        airport_name = airport.name if hasattr(airport, 'name') and airport.name else f"机场{airport.id}"
-
-        if is_open:
-            print(f"    ✓ 机场状态检查: {airport_name} 开放 (来源: {status_source})")
-        else:
-            print(f"    ❌ 机场状态检查: {airport_name} 关闭 (来源: {status_source})")
+        if logger.isEnabledFor(logging.DEBUG):
+            airport_name = getattr(airport, 'name', None) or f"机场{airport.id}"
+            if is_open:
+                logger.debug("✓ 机场状态检查: %s 开放 (来源: %s)", airport_name, status_source)
+            else:
+                logger.debug("❌ 机场状态检查: %s 关闭 (来源: %s)", airport_name, status_source)
 
         return is_open
 
@@ -54,58 +307,142 @@ class AirportCapabilityRules:
             is_open: 开放状态 (True/False)
             resources: 资源字典
         """
-        if 'airport_status' not in resources:
-            resources['airport_status'] = {}
-
-        old_status = resources['airport_status'].get(airport_id, True)
-        resources['airport_status'][airport_id] = is_open
+        airport_status = resources.setdefault('airport_status', {})
+        old_status = airport_status.get(airport_id, True)
+        airport_status[airport_id] = is_open
 
         status_text = "开放" if is_open else "关闭"
         old_status_text = "开放" if old_status else "关闭"
 
         if old_status != is_open:
-            print(f"    📝 机场状态更新: 机场{airport_id} {old_status_text} -> {status_text}")
+            logger.debug("📝 机场状态更新: 机场%s %s -> %s", airport_id, old_status_text, status_text)
         else:
-            print(f"    📝 机场状态确认: 机场{airport_id} 保持{status_text}")
+            logger.debug("📝 机场状态确认: 机场%s 保持%s", airport_id, status_text)
 
     """2.检查指控人员工作负荷约束规则"""
     @staticmethod
     def _check_airport_constraints(solution: Any, airport_id: int, drone_type: int,
                                    airports: Dict, target_drone_key: str) -> bool:
-        """检查指控人员工作负荷约束是否满足"""
+        """
+        检查指控人员工作负荷约束是否满足
+
+        注意：一旦 Solution 上存在 update_drone_assignment 维护的计数器，本方法直接信任计数器，
+        此后对 solution.assignments 的所有修改都必须经由 update_drone_assignment，
+        直接改写 assignments 中的条目不会反映到计数器上。整体替换 assignments 字典时计数器会被丢弃并重建。
+        """
+        # 目标无人机已有任务时不会新增占用，无需统计
+        if solution.assignments.get(target_drone_key):
+            logger.debug("✅ 机场 %s 约束检查通过: 无人机 %s 已有任务", airport_id, target_drone_key)
+            return True
+
         airport = airports[airport_id]
+        total_limits = getattr(airport, 'total_limits', 0)
+        type_limits = getattr(airport, 'type_limits', None)
+        type_limit = type_limits.get(drone_type, 0) if type_limits is not None else 0
+
+        # 统计当前机场已使用的无人机
+        used_by_airport = getattr(solution, 'used_total_by_airport', None)
+        if used_by_airport is not None and getattr(solution, '_counted_assignments', None) is not solution.assignments:
+            # assignments 字典已被整体替换，计数器失效，重新全量统计
+            AirportCapabilityRules._init_airport_counters(solution)
+            used_by_airport = solution.used_total_by_airport
+        if used_by_airport is not None:
+            # 由 update_drone_assignment 增量维护的计数器，O(1) 查询（按无人机键前缀字符串索引）
+            airport_key = str(airport_id)
+            used_total = used_by_airport[airport_key]
+            current_type_used = solution.used_by_type_by_airport[airport_key][drone_type]
+        else:
+            # 兼容未维护计数器的Solution：扫描该机场的分配记录
+            airport_assignments = getattr(solution, 'assignments_by_airport', None)
+            if airport_assignments is not None:
+                drone_tasks = airport_assignments.get(airport_id, {}).items()
+            else:
+                prefix = f"{airport_id}_"
+                drone_tasks = ((key, tasks) for key, tasks in solution.assignments.items()
+                               if key.startswith(prefix))
+
+            used_total = 0
+            current_type_used = 0
+            for key, tasks in drone_tasks:
+                if tasks:  # 有任务分配的无人机
+                    used_total += 1
+                    if solution.drone_info[key]['type'] == drone_type:
+                        current_type_used += 1
+
+        # 目标无人机还没有任务，检查添加它是否违反约束
+        # 检查总数限制
+        if hasattr(airport, 'total_limits') and used_total >= total_limits:
+            logger.debug("❌ 机场 %s 总数限制已达上限: %s/%s", airport_id, used_total, total_limits)
+            return False
 
-        # 统计当前机场已使用的无人机（不包括目标无人机，因为它可能已经有任务）
-        used_total = 0
-        used_by_type = {}
+        # 检查类型限制
+        if current_type_used >= type_limit:
+            logger.debug("❌ 机场 %s 类型 %s 限制已达上限: %s/%s",
+                         airport_id, drone_type, current_type_used, type_limit)
+            return False
 
-        for key, tasks in solution.assignments.items():
-            if tasks and key.startswith(f"{airport_id}_"):  # 有任务分配的无人机
-                used_total += 1
-                current_type = solution.drone_info[key]['type']
-                used_by_type[current_type] = used_by_type.get(current_type, 0) + 1
-
-        # 如果目标无人机还没有任务，需要检查添加它是否违反约束
-        if target_drone_key not in solution.assignments or not solution.assignments[target_drone_key]:
-            # 检查总数限制
-            if hasattr(airport, 'total_limits') and used_total >= airport.total_limits:
-                print(f"    ❌ 机场 {airport_id} 总数限制已达上限: {used_total}/{airport.total_limits}")
-                return False
-
-            # 检查类型限制
-            current_type_used = used_by_type.get(drone_type, 0)
-            type_limit = airport.type_limits.get(drone_type, 0) if hasattr(airport, 'type_limits') else 0
-            if current_type_used >= type_limit:
-                print(f"    ❌ 机场 {airport_id} 类型 {drone_type} 限制已达上限: {current_type_used}/{type_limit}")
-                return False
-
-        total_limits = airport.total_limits if hasattr(airport, 'total_limits') else 0
-        type_limit = airport.type_limits.get(drone_type, 0) if hasattr(airport, 'type_limits') else 0
-        
-        print(f"    ✅ 机场 {airport_id} 约束检查通过: 总数 {used_total}/{total_limits}, "
-              f"类型 {drone_type} {used_by_type.get(drone_type, 0)}/{type_limit}")
+        logger.debug("✅ 机场 %s 约束检查通过: 总数 %s/%s, 类型 %s %s/%s",
+                     airport_id, used_total, total_limits, drone_type, current_type_used, type_limit)
         return True
 
+    @staticmethod
+    def update_drone_assignment(solution: Any, airport_id: int, drone_key: str, task_ids: List[int]):
+        """
+        更新无人机任务分配并维护按机场分组的分配表及使用计数器（辅助方法）
+
+        Args:
+            solution: Solution对象，需包含 assignments 和 drone_info
+            airport_id: 无人机所属机场ID
+            drone_key: 无人机键（"{airport_id}_..." 格式）
+            task_ids: 新的任务ID列表，空列表表示取消分配；保存的是其副本，之后原地修改该列表不影响分配表
+
+        注意：首次调用后 Solution 会带上增量计数器，之后所有分配修改都必须通过本方法完成，
+        绕过本方法直接写 solution.assignments[key] 会导致计数器与分配表不一致。
+        计数器统一以无人机键前缀（即 str(airport_id)）为键，机场ID传整数或数字字符串结果一致。
+        """
+        if (not hasattr(solution, 'used_total_by_airport')
+                or getattr(solution, '_counted_assignments', None) is not solution.assignments):
+            AirportCapabilityRules._init_airport_counters(solution)
+
+        airport_key = str(airport_id)
+        task_ids = list(task_ids)
+        was_used = bool(solution.assignments.get(drone_key))
+        is_used = bool(task_ids)
+        solution.assignments[drone_key] = task_ids
+        solution.assignments_by_airport.setdefault(airport_key, {})[drone_key] = task_ids
+        # 递增版本号，使 EfficiencyOptimizationRules 的航线缓存失效
+        if getattr(solution, 'version', None) is not None:
+            solution.version += 1
+
+        if was_used == is_used:
+            return
+
+        delta = 1 if is_used else -1
+        drone_type = solution.drone_info[drone_key]['type']
+        solution.used_total_by_airport[airport_key] += delta
+        solution.used_by_type_by_airport[airport_key][drone_type] += delta
+
+    @staticmethod
+    def _init_airport_counters(solution: Any):
+        """
+        根据当前分配表初始化按机场分组的分配表及使用计数器（仅首次调用时全量扫描一次）
+
+        各表以无人机键前缀字符串为键，与调用方传入的机场ID类型无关。
+        """
+        solution.assignments_by_airport = {}
+        solution.used_total_by_airport = defaultdict(int)
+        solution.used_by_type_by_airport = defaultdict(lambda: defaultdict(int))
+        solution._counted_assignments = solution.assignments
+
+        for key, tasks in solution.assignments.items():
+            # 无人机键约定为 "{airport_id}_..."
+            airport_key = key.split('_', 1)[0]
+            solution.assignments_by_airport.setdefault(airport_key, {})[key] = tasks
+            if not tasks:
+                continue
+            solution.used_total_by_airport[airport_key] += 1
+            solution.used_by_type_by_airport[airport_key][solution.drone_info[key]['type']] += 1
+
     """3.可用跑道数量约束规则"""
     @staticmethod
     def takeoff_runway_capacity(drone, task, event_time, resources):
@@ -119,53 +456,13 @@ class AirportCapabilityRules:
             resources: 资源字典，包含：
                 - runway_counts: {airport_id: runway_count} 各机场跑道数量
                 - runway_occupancy: {airport_id: [(start_time, end_time, drone_id, event_type), ...]} 跑道占用记录
+                - runway_index: {airport_id: (starts, ends, records)} 跑道占用有序索引（自动维护）
                 - takeoff_duration: float, 起飞占用跑道时长（分钟），默认5分钟
 
         Returns:
             bool: True表示有可用跑道，False表示跑道容量不足
         """
-        if not hasattr(drone, 'airport') or drone.airport is None:
-            print(f"    ❌ 无人机{drone.id if hasattr(drone, 'id') else '未知'}没有归属机场")
-            return False
-
-        airport = drone.airport
-        airport_id = airport.id if hasattr(airport, 'id') else 'unknown'
-
-        # 获取机场跑道数量
-        runway_count = resources.get('runway_counts', {}).get(airport_id, 1)
-
-        # 获取起飞占用时长
-        takeoff_duration = resources.get('takeoff_duration', 5.0)
-
-        # 计算起飞占用的时间窗口
-        window_start = event_time
-        window_end = event_time + takeoff_duration
-
-        # 获取该机场的跑道占用记录
-        runway_occupancy = resources.get('runway_occupancy', {}).get(airport_id, [])
-
-        # 统计时间窗口内与当前起飞时间重叠的占用数量
-        overlapping_count = 0
-        for occupied_start, occupied_end, occupied_drone_id, event_type in runway_occupancy:
-            # 检查时间段是否重叠: 只要不是完全不重叠就算重叠
-            if not (window_end <= occupied_start or window_start >= occupied_end):
-                overlapping_count += 1
-                print(f"      重叠占用: 无人机{occupied_drone_id} {event_type} "
-                      f"[{occupied_start:.2f}, {occupied_end:.2f}]")
-
-        airport_name = airport.name if hasattr(airport, 'name') and airport.name else airport_id
-        print(f"    机场{airport_name} 跑道总数: {runway_count}")
-        print(f"    起飞时间窗口: [{window_start:.2f}, {window_end:.2f}] (持续{takeoff_duration}分钟)")
-        print(f"    时间窗口内占用跑道数: {overlapping_count}/{runway_count}")
-
-        # 检查是否还有可用跑道
-        if overlapping_count >= runway_count:
-            print(f"    ❌ 跑道容量不足: 所有跑道均被占用")
-            return False
-
-        available_runways = runway_count - overlapping_count
-        print(f"    ✓ 跑道容量充足: 有 {available_runways} 条跑道可用")
-        return True
+        return AirportCapabilityRules._runway_capacity(drone, task, event_time, resources, 'takeoff')
 
     @staticmethod
     def landing_runway_capacity(drone, task, event_time, resources):
@@ -179,52 +476,68 @@ class AirportCapabilityRules:
             resources: 资源字典，包含：
                 - runway_counts: {airport_id: runway_count} 各机场跑道数量
                 - runway_occupancy: {airport_id: [(start_time, end_time, drone_id, event_type), ...]} 跑道占用记录
+                - runway_index: {airport_id: (starts, ends, records)} 跑道占用有序索引（自动维护）
                 - landing_duration: float, 降落占用跑道时长（分钟），默认5分钟
 
         Returns:
             bool: True表示有可用跑道，False表示跑道容量不足
         """
-        if not hasattr(drone, 'airport') or drone.airport is None:
-            print(f"    ❌ 无人机{drone.id if hasattr(drone, 'id') else '未知'}没有归属机场")
+        return AirportCapabilityRules._runway_capacity(drone, task, event_time, resources, 'landing')
+
+    @staticmethod
+    def _runway_capacity(drone, task, event_time, resources, kind):
+        """
+        起飞/降落跑道容量约束检查的公共实现
+
+        Args:
+            drone: Drone对象
+            task: Task对象
+            event_time: 起飞/降落时间点
+            resources: 资源字典，参见 takeoff_runway_capacity / landing_runway_capacity
+            kind: 'takeoff' 或 'landing'，决定使用的占用时长配置项
+
+        Returns:
+            bool: True表示有可用跑道，False表示跑道容量不足
+        """
+        airport = getattr(drone, 'airport', None)
+        if airport is None:
+            logger.debug("❌ 无人机%s没有归属机场", getattr(drone, 'id', '未知'))
             return False
 
-        airport = drone.airport
-        airport_id = airport.id if hasattr(airport, 'id') else 'unknown'
+        airport_id = getattr(airport, 'id', 'unknown')
 
         # 获取机场跑道数量
         runway_count = resources.get('runway_counts', {}).get(airport_id, 1)
 
-        # 获取降落占用时长
-        landing_duration = resources.get('landing_duration', 5.0)
+        # 获取起飞/降落占用时长
+        duration_key = 'takeoff_duration' if kind == 'takeoff' else 'landing_duration'
+        event_duration = resources.get(duration_key, 5.0)
 
-        # 计算降落占用的时间窗口
+        # 计算占用的时间窗口
         window_start = event_time
-        window_end = event_time + landing_duration
-
-        # 获取该机场的跑道占用记录
-        runway_occupancy = resources.get('runway_occupancy', {}).get(airport_id, [])
-
-        # 统计时间窗口内与当前降落时间重叠的占用数量
-        overlapping_count = 0
-        for occupied_start, occupied_end, occupied_drone_id, event_type in runway_occupancy:
-            # 检查时间段是否重叠
-            if not (window_end <= occupied_start or window_start >= occupied_end):
-                overlapping_count += 1
-                print(f"      重叠占用: 无人机{occupied_drone_id} {event_type} "
-                      f"[{occupied_start:.2f}, {occupied_end:.2f}]")
-
-        airport_name = airport.name if hasattr(airport, 'name') and airport.name else airport_id
-        print(f"    机场{airport_name} 跑道总数: {runway_count}")
-        print(f"    降落时间窗口: [{window_start:.2f}, {window_end:.2f}] (持续{landing_duration}分钟)")
-        print(f"    时间窗口内占用跑道数: {overlapping_count}/{runway_count}")
+        window_end = event_time + event_duration
+
+        # 统计时间窗口内重叠的占用数量
+        starts, ends, records = AirportCapabilityRules._get_runway_index(airport_id, resources)
+        overlapping_count = AirportCapabilityRules._count_overlaps(starts, ends, window_start, window_end, records)
+        if logger.isEnabledFor(logging.DEBUG):
+            for occupied_start, occupied_end, occupied_drone_id, event_type in \
+                    resources.get('runway_occupancy', {}).get(airport_id, []):
+                if not (window_end <= occupied_start or window_start >= occupied_end):
+                    logger.debug("重叠占用: 无人机%s %s [%.2f, %.2f]",
+                                 occupied_drone_id, event_type, occupied_start, occupied_end)
+
+            airport_name = getattr(airport, 'name', None) or airport_id
+            logger.debug("机场%s 跑道总数: %s, %s时间窗口: [%.2f, %.2f] (持续%s分钟), 时间窗口内占用跑道数: %s/%s",
+                         airport_name, runway_count, '起飞' if kind == 'takeoff' else '降落',
+                         window_start, window_end, event_duration, overlapping_count, runway_count)
 
         # 检查是否还有可用跑道
         if overlapping_count >= runway_count:
-            print(f"    ❌ 跑道容量不足: 所有跑道均被占用")
+            logger.debug("❌ 跑道容量不足: 所有跑道均被占用")
             return False
 
-        available_runways = runway_count - overlapping_count
-        print(f"    ✓ 跑道容量充足: 有 {available_runways} 条跑道可用")
+        logger.debug("✓ 跑道容量充足: 有 %s 条跑道可用", runway_count - overlapping_count)
         return True
 
     @staticmethod
@@ -240,12 +553,12 @@ class AirportCapabilityRules:
             drone_id: 无人机ID
             event_type: 事件类型 ('takeoff' 或 'landing')
             resources: 资源字典
-        """
-        if 'runway_occupancy' not in resources:
-            resources['runway_occupancy'] = {}
 
-        if airport_id not in resources['runway_occupancy']:
-            resources['runway_occupancy'][airport_id] = []
+        注意：跑道索引只在占用记录列表被整体替换或记录数量变化时重建，
+        删除记录请使用 remove_runway_occupancy，不要原地替换列表中的记录。
+        """
+        runway_occupancy = resources.setdefault('runway_occupancy', {}).setdefault(airport_id, [])
+        starts, ends, _ = AirportCapabilityRules._get_runway_index(airport_id, resources)
 
         # 添加新的占用记录
         occupancy_record = (
@@ -254,10 +567,105 @@ class AirportCapabilityRules:
             drone_id,  # 无人机ID
             event_type  # 事件类型
         )
-        resources['runway_occupancy'][airport_id].append(occupancy_record)
+        runway_occupancy.append(occupancy_record)
+        insort(starts, occupancy_record[0])
+        insort(ends, occupancy_record[1])
 
-        print(f"    📝 记录跑道占用: 机场{airport_id} 无人机{drone_id} "
-              f"{event_type} [{event_time:.2f}, {event_time + event_duration:.2f}]")
+        logger.debug("📝 记录跑道占用: 机场%s 无人机%s %s [%.2f, %.2f]",
+                     airport_id, drone_id, event_type, event_time, event_time + event_duration)
+
+    @staticmethod
+    def remove_runway_occupancy(airport_id, occupancy_record, resources):
+        """
+        删除一条跑道占用记录并同步更新有序索引（辅助方法）
+
+        Args:
+            airport_id: 机场ID
+            occupancy_record: 要删除的占用记录 (start_time, end_time, drone_id, event_type)
+            resources: 资源字典
+        """
+        runway_occupancy = resources.get('runway_occupancy', {}).get(airport_id, [])
+        starts, ends, _ = AirportCapabilityRules._get_runway_index(airport_id, resources)
+
+        runway_occupancy.remove(occupancy_record)
+        del starts[bisect_left(starts, occupancy_record[0])]
+        del ends[bisect_left(ends, occupancy_record[1])]
+
+        logger.debug("📝 删除跑道占用: 机场%s 无人机%s %s [%.2f, %.2f]",
+                     airport_id, occupancy_record[2], occupancy_record[3],
+                     occupancy_record[0], occupancy_record[1])
+
+    @staticmethod
+    def _get_runway_index(airport_id, resources):
+        """
+        获取机场跑道占用的有序索引（辅助方法）
+
+        索引保存在 resources['runway_index'][airport_id] = (starts, ends, records)，
+        starts、ends 分别为所有占用记录的开始时间、结束时间升序 array('d') 缓冲区，
+        records 为建立索引时的 runway_occupancy 列表对象本身。
+        有效性检查为 O(1)：列表被整体替换或记录数量与索引不一致时重建索引。
+        增删记录应通过 update_runway_occupancy / remove_runway_occupancy 进行（二者同步维护索引）；
+        原地替换列表中的记录（数量不变）不会被检测到。
+        """
+        runway_occupancy = resources.get('runway_occupancy', {}).get(airport_id, [])
+        runway_index = resources.setdefault('runway_index', {})
+        index = runway_index.get(airport_id)
+
+        if index is None or index[2] is not runway_occupancy or len(index[0]) != len(runway_occupancy):
+            starts = array('d', sorted(record[0] for record in runway_occupancy))
+            ends = array('d', sorted(record[1] for record in runway_occupancy))
+            index = runway_index[airport_id] = (starts, ends, runway_occupancy)
+
+        return index
+
+    @staticmethod
+    def _count_overlaps(starts, ends, window_start, window_end, records):
+        """
+        统计与时间窗口 [window_start, window_end) 重叠的占用数量
+
+        重叠条件为 start < window_end 且 end > window_start。时间窗口时长为正时，
+        所有 end <= window_start 的占用必然满足 start < window_end，
+        因此重叠数 = #(start < window_end) - #(end <= window_start)，两次二分即可，O(log M)。
+        时长为0或负（起降占用时长配置为0）时该等式不成立，改为逐条扫描 records。
+        """
+        if window_end <= window_start:
+            return sum(1 for record in records if record[0] < window_end and record[1] > window_start)
+        return bisect_left(starts, window_end) - bisect_right(ends, window_start)
+
+    @staticmethod
+    def runway_overlap_counts(airport_id, window_starts, window_ends, resources):
+        """
+        批量统计多个时间窗口内的跑道占用数量（向量化）
+
+        Args:
+            airport_id: 机场ID
+            window_starts: 时间窗口开始时间序列
+            window_ends: 时间窗口结束时间序列
+            resources: 资源字典，包含 runway_occupancy
+
+        Returns:
+            np.ndarray: 每个时间窗口内重叠的占用数量
+        """
+        starts, ends, records = AirportCapabilityRules._get_runway_index(airport_id, resources)
+        window_starts = np.asarray(window_starts, dtype=np.float64)
+        window_ends = np.asarray(window_ends, dtype=np.float64)
+
+        if not starts:
+            return np.zeros(window_starts.shape, dtype=np.int64)
+
+        # 复制为独立数组：numba编译期间可能暂时持有参数引用，若直接使用
+        # np.frombuffer 视图，会导致后续 insort 扩容 array('d') 时抛出 BufferError
+        starts_arr = np.array(starts, dtype=np.float64)
+        ends_arr = np.array(ends, dtype=np.float64)
+        counts = _count_overlaps_batch(starts_arr, ends_arr, window_starts.ravel(), window_ends.ravel())
+
+        # 时长非正的时间窗口不满足二分计数的前提，按占用记录逐条比较
+        degenerate = np.flatnonzero(window_ends.ravel() <= window_starts.ravel())
+        if len(degenerate):
+            record_times = np.array([record[:2] for record in records], dtype=np.float64)
+            counts[degenerate] = ((record_times[:, 0] < window_ends.ravel()[degenerate, None]) &
+                                  (record_times[:, 1] > window_starts.ravel()[degenerate, None])).sum(axis=1)
+        return counts.reshape(window_starts.shape)
 
     """4.飞机数量约束规则"""
     @staticmethod
@@ -266,12 +674,12 @@ class AirportCapabilityRules:
 
         # 检查每个型号数量限制
         type_available = min(
-            resources['type_counts'].get(drone.type if hasattr(drone, 'type') else 'unknown', 0),
-            resources['type_limits'].get(drone.type if hasattr(drone, 'type') else 'unknown', 0)
+            resources['type_counts'].get(getattr(drone, 'type', 'unknown'), 0),
+            resources['type_limits'].get(getattr(drone, 'type', 'unknown'), 0)
         )
-        print(f"      类型可用数量: {type_available}")
+        logger.debug("类型可用数量: %s", type_available)
         if type_available <= 0:
-            print(f"      ❌ 类型配额不足")
+            logger.debug("❌ 类型配额不足")
             return False
         return True
 
@@ -284,11 +692,11 @@ class AircraftCapabilityRules:
     def type_capacity(drone, task, resources):
         """飞机类型约束规则"""
         # 检查类型限制
-        drone_type = drone.type if hasattr(drone, 'type') else 'unknown'
-        required_types = task.required_types if hasattr(task, 'required_types') else []
+        drone_type = getattr(drone, 'type', 'unknown')
+        required_types = getattr(task, 'required_types', ())
         
         if drone_type not in required_types:
-            print(f"      ❌ 类型不匹配: {drone_type} not in {required_types}")
+            logger.debug("❌ 类型不匹配: %s not in %s", drone_type, required_types)
             return False
         else:
             return True
@@ -297,67 +705,64 @@ class AircraftCapabilityRules:
     @staticmethod
     def payload_capacity(drone, task, resources):
         """有效载荷能力约束规则"""
-        # 检查载荷匹配
-        payload_match = True
-        required_weapons = {}  # 记录需要的武器
-        print(f"      载荷检查:")
-
-        required_payloads = task.required_payloads if hasattr(task, 'required_payloads') else {}
-        
-        for payload_key, required_values in required_payloads.items():
-            print(f"        检查载荷 {payload_key}: 需求{required_values}")
-
-            if not hasattr(drone, 'payload_capability') or payload_key not in drone.payload_capability:
-                print(f"          ❌ 无人机没有此载荷类型")
-                payload_match = False
-                break
-
-            drone_range, drone_level = drone.payload_capability[payload_key]
-            req_range, req_level = required_values
-            print(f"          无人机载荷: 范围={drone_range}, 等级/数量={drone_level}")
-            print(f"          需求: 范围≥{req_range}, 等级/数量≥{req_level}")
-
-            if drone_range < req_range or drone_level < req_level:
-                print(f"          ❌ 载荷能力不足")
-                payload_match = False
-                break
+        payload_capability = getattr(drone, 'payload_capability', {})
+        # 武器是消耗类，类型匹配也可能数量不足，需要同时检查库存（只检查打击类）
+        weapon_inventory = resources.get('weapon_inventory', {})
 
-            # 如果是武器，记录需求
-            if isinstance(payload_key, int) and payload_key == 1:  # 打击类
-                required_weapons[payload_key] = req_level
-                print(f"          武器需求记录: {payload_key} -> {req_level}")
+        # 按需求严格程度降序检查，找到第一个不满足的需求即停止
+        failed = next(
+            ((payload_key, req_range, req_level)
+             for payload_key, (req_range, req_level) in AircraftCapabilityRules._sorted_payload_items(task)
+             if payload_key not in payload_capability
+             or payload_capability[payload_key][0] < req_range
+             or payload_capability[payload_key][1] < req_level
+             or (payload_key in _WEAPON_KEYS and weapon_inventory.get(payload_key, 0) < req_level)),
+            None
+        )
+        if failed is None:
+            return True
 
-        if not payload_match:
-            print(f"      ❌ 载荷匹配失败")
-            return False
+        if logger.isEnabledFor(logging.DEBUG):
+            payload_key, req_range, req_level = failed
+            if payload_key not in payload_capability:
+                logger.debug("❌ 载荷匹配失败: 无人机没有载荷类型 %s", payload_key)
+            else:
+                drone_range, drone_level = payload_capability[payload_key]
+                if drone_range < req_range or drone_level < req_level:
+                    logger.debug("❌ 载荷匹配失败: 载荷 %s 能力不足, 无人机 范围=%s, 等级/数量=%s; "
+                                 "需求 范围≥%s, 等级/数量≥%s",
+                                 payload_key, drone_range, drone_level, req_range, req_level)
+                else:
+                    logger.debug("❌ 武器库存不足: %s 需要%s, 可用%s",
+                                 payload_key, req_level, weapon_inventory.get(payload_key, 0))
+        return False
 
-        # 检查武器库存是否足够（只检查打击类），武器是消耗类，类型匹配也可能数量不足
-        weapon_sufficient = True
-        weapon_inventory = resources.get('weapon_inventory', {})
-        
-        for weapon_key, needed_count in required_weapons.items():
-            available_count = weapon_inventory.get(weapon_key, 0)
-            print(f"        武器库存检查 {weapon_key}: 需要{needed_count}, 可用{available_count}")
-            if available_count < needed_count:
-                weapon_sufficient = False
-                print(f"          ❌ 武器库存不足")
-                break
+    @staticmethod
+    def _sorted_payload_items(task):
+        """
+        获取按严格程度（range * level）降序排列的载荷需求列表
 
-        if not weapon_sufficient:
-            print(f"      ❌ 武器库存不足")
-            return False
+        结果以 (required_payloads, items) 缓存在 task._sorted_payload_items 上，
+        仅当 task.required_payloads 仍是同一个字典对象时复用；重新赋值需求字典后自动重新排序。
+        """
+        required_payloads = getattr(task, 'required_payloads', {})
+        cached = getattr(task, '_sorted_payload_items', None)
+        if cached is not None and cached[0] is required_payloads:
+            return cached[1]
 
-        return True
+        items = sorted(required_payloads.items(), key=lambda kv: -(kv[1][0] * kv[1][1]))
+        _set_cache_attr(task, '_sorted_payload_items', (required_payloads, items))
+        return items
 
     """3.航程约束规则"""
     @staticmethod
     def range_constraint(drone, task, total_distance):
         """航程约束检查规则"""
-        max_range = drone.max_range if hasattr(drone, 'max_range') else 0
+        max_range = getattr(drone, 'max_range', 0)
         
         # 检查航程
         if total_distance > max_range:
-            print(f"        ❌ 航程超限: {total_distance} > {max_range}")
+            logger.debug("❌ 航程超限: %s > %s", total_distance, max_range)
             return False
 
         return True
@@ -366,9 +771,9 @@ class AircraftCapabilityRules:
     @staticmethod
     def speed_constraint(drone, task):
         """速度约束检查规则"""
-        cruise_speed = drone.cruise_speed if hasattr(drone, 'cruise_speed') else 0
-        task_distance = task.distance if hasattr(task, 'distance') else 0
-        task_max_duration = task.max_duration if hasattr(task, 'max_duration') else 0
+        cruise_speed = getattr(drone, 'cruise_speed', 0)
+        task_distance = getattr(task, 'distance', 0)
+        task_max_duration = getattr(task, 'max_duration', 0)
         
         if task_max_duration <= 0:
             return True
@@ -382,30 +787,66 @@ class AircraftCapabilityRules:
         """
         维修保养需求约束规则；影响可用剩余航程。
 
+        若维修里程通过 update_maintenance_remaining 维护（resources 中存在 _maint_version），
+        结果缓存在 drone._effective_range_cache 上，维修里程未更新时直接复用。
+        注意：启用版本号后，对 maintenance_remaining 的所有修改都必须经由 update_maintenance_remaining，
+        直接改写字典条目不会递增版本号，缓存将返回旧值；整体替换字典则会自动失效。
+
         Args:
             drone: Drone对象 - 需要检查的无人机
             resources: 资源字典，包含：
                 - maintenance_remaining: {drone_id: remaining_range} 各无人机距离下次大修的剩余里程(m)
+                - _maint_version: 维修里程版本号（由 update_maintenance_remaining 维护，可选）
 
         Returns:
             float: 有效最大航程（米），取max_range和剩余维修里程的较小值
         """
+        maint_version = resources.get('_maint_version')
+        maintenance = resources.get('maintenance_remaining', {})
+
+        if maint_version is not None:
+            cached = getattr(drone, '_effective_range_cache', None)
+            if cached is not None and cached[0] == maint_version and cached[1] is maintenance:
+                return cached[2]
+
         # 获取无人机的最大航程
-        max_range = drone.max_range if hasattr(drone, 'max_range') else float('inf')
+        max_range = getattr(drone, 'max_range', _INF)
 
         # 获取距离下次大修的剩余里程
-        drone_id = drone.id if hasattr(drone, 'id') else 'unknown'
-        maintenance_remaining = resources.get('maintenance_remaining', {}).get(drone_id, float('inf'))
+        drone_id = getattr(drone, 'id', 'unknown')
+        maintenance_remaining = maintenance.get(drone_id, _INF)
 
         # 取两者较小值
         effective_range = min(max_range, maintenance_remaining)
 
         # 如果维修里程成为限制因素，给出提示
         if effective_range < max_range:
-            print(f"    ⚠️  维修需求限制: 有效航程被维修里程约束")
+            logger.debug("⚠️ 维修需求限制: 有效航程被维修里程约束")
+
+        if maint_version is not None:
+            _set_cache_attr(drone, '_effective_range_cache', (maint_version, maintenance, effective_range))
 
         return effective_range
 
+    @staticmethod
+    def update_maintenance_remaining(drone_id, remaining_range, resources):
+        """
+        更新无人机剩余维修里程（辅助方法）
+
+        Args:
+            drone_id: 无人机ID
+            remaining_range: 距离下次大修的剩余里程(m)
+            resources: 资源字典
+
+        注意：调用本方法后 resources 中会出现 _maint_version，此后维修里程只能通过本方法修改，
+        否则 effective_range_constraint 的缓存不会感知变化。
+        """
+        resources.setdefault('maintenance_remaining', {})[drone_id] = remaining_range
+        # 版本号递增，使 effective_range_constraint 的缓存失效
+        resources['_maint_version'] = resources.get('_maint_version', 0) + 1
+
+        logger.debug("📝 维修里程更新: 无人机%s 剩余%s", drone_id, remaining_range)
+
 
 class TaskCharacteristicRules:
     """任务特性约束规则库"""
@@ -414,35 +855,36 @@ class TaskCharacteristicRules:
     @staticmethod
     def time_window_constraint(drone, task, distance):
         """时间窗口约束"""
-        drone_speed = drone.speed if hasattr(drone, 'speed') else 0
+        drone_speed = getattr(drone, 'speed', 0)
         if drone_speed <= 0:
-            print(f"        ❌ 无人机速度无效: {drone_speed}")
+            logger.debug("❌ 无人机速度无效: %s", drone_speed)
             return False
-            
+
+        # 任务时间属性一次性读入局部变量
+        task_start = getattr(task, 'start_time', 0)
+        task_end = getattr(task, 'end_time', _INF)
+        task_duration = getattr(task, 'duration', 0)
+
         # 单程飞行时间
         travel_time = distance / drone_speed
         # 最优起飞时间
-        task_start = task.start_time if hasattr(task, 'start_time') else 0
         optimal_takeoff = task_start - travel_time
         # 实际起飞时间
         actual_takeoff = max(0.0, optimal_takeoff)
         # 实际到达时间
         earliest_arrival = actual_takeoff + travel_time
-        print(f"        - 最优起飞时间: {optimal_takeoff:.2f}s")
-        print(f"        - 实际起飞时间: {actual_takeoff:.2f}s")
-        print(f"        - 最早到达时间: {earliest_arrival:.2f}s")
-        
-        task_end = task.end_time if hasattr(task, 'end_time') else float('inf')
+        logger.debug("最优起飞时间: %.2fs, 实际起飞时间: %.2fs, 最早到达时间: %.2fs",
+                     optimal_takeoff, actual_takeoff, earliest_arrival)
+
         # 检查飞机能否在任务时间窗口内到达
         if earliest_arrival > task_end:
-            print(f"        ❌ 无法在截止时间前到达")
+            logger.debug("❌ 无法在截止时间前到达")
             return False
-            
-        task_duration = task.duration if hasattr(task, 'duration') else 0
+
         # 检查飞机能否在截止时间前完成任务
         actual_start = max(earliest_arrival, task_start)
         if actual_start + task_duration > task_end:
-            print(f"        ❌ 任务无法在截止时间前完成")
+            logger.debug("❌ 任务无法在截止时间前完成")
             return False
         return True
 
@@ -476,19 +918,19 @@ class TaskCharacteristicRules:
 
             # 返回: {1: "可行", 2: "可行", 3: "航程超限..."}
         """
-        # 导入并创建 SolutionChecker 实例（用于借用其辅助方法）
-        try:
-            from solution_checker import SolutionChecker
-            checker = SolutionChecker()
-            checker.task_dict = task_dict
-            checker.distance_calculator = distance_calculator
-        except ImportError:
+        # 创建 SolutionChecker 实例（用于借用其辅助方法）
+        SolutionChecker = _get_solution_checker()
+        if SolutionChecker is None:
             # 如果没有SolutionChecker，返回错误
             results = {}
             for task_id in task_ids:
                 results[task_id] = "缺少SolutionChecker模块，无法检查任务序列"
             return results
 
+        checker = SolutionChecker()
+        checker.task_dict = task_dict
+        checker.distance_calculator = distance_calculator
+
         # ========== 以下是主逻辑 ==========
         results = {}
 
@@ -502,13 +944,18 @@ class TaskCharacteristicRules:
             )
         except Exception as e:
             optimal_takeoff = 0.0
-            print(f"        ⚠️  无法计算最优起飞时间: {e}")
+            logger.warning("⚠️ 无法计算最优起飞时间: %s", e)
 
         # 初始化无人机状态
-        current_location = ('airport', drone.airport.id) if hasattr(drone, 'airport') and hasattr(drone.airport, 'id') else ('airport', 'unknown')
+        current_location = ('airport', getattr(getattr(drone, 'airport', None), 'id', 'unknown'))
         current_time = optimal_takeoff  # 使用计算出的最优起飞时间
         current_range = 0.0
-        current_payload = copy.deepcopy(drone.payload_capability) if hasattr(drone, 'payload_capability') else {}
+        # 载荷值均为不可变元组时浅拷贝即可隔离消耗，否则深拷贝以免改动无人机原始载荷
+        payload_capability = getattr(drone, 'payload_capability', {})
+        if all(isinstance(value, tuple) for value in payload_capability.values()):
+            current_payload = dict(payload_capability)
+        else:
+            current_payload = copy.deepcopy(payload_capability)
 
         for i, task_id in enumerate(task_ids):
             task = task_dict.get(task_id)
@@ -547,7 +994,7 @@ class TaskCharacteristicRules:
                 # 更新载荷状态
                 checker._consume_task_payload(current_payload, task)
             except Exception as e:
-                print(f"        ⚠️  更新无人机状态失败: {e}")
+                logger.warning("⚠️ 更新无人机状态失败: %s", e)
                 results[task_id] = f"执行失败: {str(e)}"
                 break
 
@@ -572,20 +1019,21 @@ class TaskCharacteristicRules:
             float: 任务权重值，越大表示优先级越高
         """
         # 1. 获取任务优先级（主导因素，占70%）
-        if not hasattr(task, 'priority'):
-            print(f"    ⚠️  任务{task.id if hasattr(task, 'id') else '未知'}缺少priority属性，使用默认值5")
+        priority = getattr(task, 'priority', None)
+        if priority is None:
+            logger.warning("⚠️ 任务%s缺少priority属性，使用默认值5", getattr(task, 'id', '未知'))
             priority = 5
         else:
-            priority = max(1, min(10, task.priority))  # 确保在1-10范围内
+            priority = max(1, min(10, priority))  # 确保在1-10范围内
 
         # 优先级反向映射：1→70分，2→63分，...，10→7分
         priority_weight = (11 - priority) * 7.0
 
         # 2. 计算辅助因素（共占30%）
-        task_duration = task.duration if hasattr(task, 'duration') else 0
-        task_required_payloads = task.required_payloads if hasattr(task, 'required_payloads') else {}
-        task_required_types = task.required_types if hasattr(task, 'required_types') else []
-        task_bandwidth = task.bandwidth if hasattr(task, 'bandwidth') else 0
+        task_duration = getattr(task, 'duration', 0)
+        task_required_payloads = getattr(task, 'required_payloads', {})
+        task_required_types = getattr(task, 'required_types', ())
+        task_bandwidth = getattr(task, 'bandwidth', 0)
 
         # 2.1 持续时间因素（占6%）
         # 持续时间越长，权重略微增加（表示任务更重要/复杂）
@@ -594,12 +1042,12 @@ class TaskCharacteristicRules:
 
         # 2.2 载荷需求因素（占6%）
         # 载荷需求越多，权重略微增加
-        payload_count = len(task_required_payloads) if task_required_payloads else 1
+        payload_count = len(task_required_payloads or ()) or 1
         payload_weight = min(payload_count * 0.6, 3.0)  # 最多加3分
 
         # 2.3 类型需求因素（占9%）
         # 类型需求越少（更灵活），权重略微增加
-        type_count = len(task_required_types) if task_required_types else 1
+        type_count = len(task_required_types or ()) or 1
         type_weight = 9.0 / type_count  # 1种类型=9分，2种=4.5分，3种=3分
 
         # 2.4 带宽需求因素（占9%）
@@ -613,56 +1061,114 @@ class TaskCharacteristicRules:
                         type_weight +
                         bandwidth_weight)
 
-        task_name = task.name if hasattr(task, 'name') and task.name else f"任务{task.id if hasattr(task, 'id') else '未知'}"
-        print(f"    {task_name} 权重计算:")
-        print(f"      优先级权重: {priority_weight:.2f} (优先级{priority})")
-        print(f"      持续时间权重: {duration_weight:.2f} ({duration_hours:.1f}h)")
-        print(f"      载荷需求权重: {payload_weight:.2f} ({payload_count}种)")
-        print(f"      类型需求权重: {type_weight:.2f} ({type_count}种)")
-        print(f"      带宽需求权重: {bandwidth_weight:.2f} ({task_bandwidth})")
-        print(f"      总权重: {total_weight:.2f}")
+        if logger.isEnabledFor(logging.DEBUG):
+            task_name = getattr(task, 'name', None) or f"任务{getattr(task, 'id', '未知')}"
+            logger.debug(
+                "%s 权重计算: 优先级权重 %.2f (优先级%s), 持续时间权重 %.2f (%.1fh), "
+                "载荷需求权重 %.2f (%s种), 类型需求权重 %.2f (%s种), 带宽需求权重 %.2f (%s), 总权重 %.2f",
+                task_name, priority_weight, priority, duration_weight, duration_hours,
+                payload_weight, payload_count, type_weight, type_count,
+                bandwidth_weight, task_bandwidth, total_weight)
 
         return float(total_weight)
 
     @staticmethod
-    def sort_tasks_by_weight(tasks):
+    def _weight(task):
         """
-        按权重对任务列表排序
+        获取任务权重（带缓存，供排序使用）
+
+        结果连同其全部输入 (priority, duration, bandwidth, 载荷需求数, 类型需求数)
+        缓存在 task._cached_weight 上，输入不变时直接复用，任一输入变化后自动重新计算。
+        计算失败时返回0.0且不缓存。
+        """
+        try:
+            key = (getattr(task, 'priority', None), getattr(task, 'duration', 0), getattr(task, 'bandwidth', 0),
+                   len(getattr(task, 'required_payloads', None) or ()),
+                   len(getattr(task, 'required_types', None) or ()))
+            cached = getattr(task, '_cached_weight', None)
+            if cached is not None and cached[0] == key:
+                return cached[1]
+
+            weight = TaskCharacteristicRules.calculate_task_weight(task)
+        except Exception as e:
+            logger.warning("⚠️ 计算任务%s权重失败: %s", getattr(task, 'id', '未知'), e)
+            return 0.0
+
+        _set_cache_attr(task, '_cached_weight', (key, weight))
+        return weight
+
+    @staticmethod
+    def batch_weights(tasks):
+        """
+        批量计算任务权重（向量化版本，计算公式与 calculate_task_weight 一致）
 
         Args:
             tasks: Task对象列表
 
         Returns:
-            list: 按权重降序排列的任务列表（权重高的在前）
+            np.ndarray: 各任务的权重值，顺序与 tasks 一致
         """
-        print(f"\n{'=' * 60}")
-        print(f"📊 任务权重排序")
-        print(f"{'=' * 60}")
+        n = len(tasks)
+        priority = np.fromiter(
+            (5 if p is None else p for p in (getattr(task, 'priority', None) for task in tasks)),
+            dtype=np.float64, count=n)
+        duration = np.fromiter((getattr(task, 'duration', 0) for task in tasks), dtype=np.float64, count=n)
+        bandwidth = np.fromiter((getattr(task, 'bandwidth', 0) for task in tasks), dtype=np.float64, count=n)
+        payload_count = np.fromiter(
+            (len(getattr(task, 'required_payloads', None) or ()) or 1 for task in tasks), dtype=np.float64, count=n)
+        type_count = np.fromiter(
+            (len(getattr(task, 'required_types', None) or ()) or 1 for task in tasks), dtype=np.float64, count=n)
+
+        priority_weight = (11 - np.clip(priority, 1, 10)) * 7.0
+        duration_weight = np.minimum(duration / 3600 * 0.3, 3.0)
+        payload_weight = np.minimum(payload_count * 0.6, 3.0)
+        type_weight = 9.0 / type_count
+        bandwidth_weight = np.minimum(bandwidth / 10.0 * 0.9, 9.0)
+
+        return priority_weight + duration_weight + payload_weight + type_weight + bandwidth_weight
 
-        # 计算每个任务的权重
-        task_weights = []
-        for task in tasks:
-            try:
-                weight = TaskCharacteristicRules.calculate_task_weight(task)
-                task_weights.append((weight, task))
-            except Exception as e:
-                print(f"    ⚠️  计算任务{task.id if hasattr(task, 'id') else '未知'}权重失败: {e}")
-                task_weights.append((0.0, task))
+    @staticmethod
+    def sort_tasks_by_weight(tasks):
+        """
+        按权重对任务列表排序
 
-        # 按权重降序排序
-        task_weights.sort(key=lambda x: x[0], reverse=True)
+        任务数量达到 _BATCH_SORT_THRESHOLD 时使用 batch_weights 向量化计算权重。
 
-        # 打印排序结果
-        print(f"\n排序结果（共{len(tasks)}个任务）：")
-        for rank, (weight, task) in enumerate(task_weights, 1):
-            task_name = task.name if hasattr(task, 'name') and task.name else f"任务{task.id if hasattr(task, 'id') else '未知'}"
-            priority = task.priority if hasattr(task, 'priority') else 5
-            print(f"  {rank}. {task_name} - 权重{weight:.2f} (优先级{priority})")
+        Args:
+            tasks: Task对象列表
 
-        print(f"{'=' * 60}\n")
+        Returns:
+            list: 按权重降序排列的任务列表（权重高的在前）
+        """
+        sorted_tasks = None
+        weights = None
 
-        # 返回排序后的任务列表
-        return [task for weight, task in task_weights]
+        if len(tasks) >= _BATCH_SORT_THRESHOLD:
+            task_list = list(tasks)
+            try:
+                weights = TaskCharacteristicRules.batch_weights(task_list)
+            except (TypeError, ValueError) as e:
+                logger.warning("⚠️ 批量计算任务权重失败，改为逐个计算: %s", e)
+            else:
+                # 稳定排序，权重相同时保持原有顺序
+                order = np.argsort(-weights, kind='stable')
+                sorted_tasks = [task_list[i] for i in order]
+                weights = weights[order]
+
+        if sorted_tasks is None:
+            # 按权重降序排序（权重按输入缓存在Task对象上，输入未变时重复排序不再重新计算）
+            sorted_tasks = sorted(tasks, key=TaskCharacteristicRules._weight, reverse=True)
+
+        # 输出排序结果
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📊 任务权重排序结果（共%d个任务）", len(tasks))
+            for rank, task in enumerate(sorted_tasks, 1):
+                task_name = getattr(task, 'name', None) or f"任务{getattr(task, 'id', '未知')}"
+                priority = getattr(task, 'priority', 5)
+                weight = weights[rank - 1] if weights is not None else TaskCharacteristicRules._weight(task)
+                logger.debug("%d. %s - 权重%.2f (优先级%s)", rank, task_name, weight, priority)
+
+        return sorted_tasks
 
     @staticmethod
     def filter_high_priority_tasks(tasks, threshold=3):
@@ -680,15 +1186,12 @@ class TaskCharacteristicRules:
         high_priority_tasks = []
 
         for task in tasks:
-            if hasattr(task, 'priority'):
-                priority = task.priority
-            else:
-                priority = 5  # 默认中等优先级
+            priority = getattr(task, 'priority', 5)  # 默认中等优先级
 
             if priority <= threshold:
                 high_priority_tasks.append(task)
 
-        print(f"    筛选出{len(high_priority_tasks)}个高优先级任务（优先级≤{threshold}）")
+        logger.debug("筛选出%d个高优先级任务（优先级≤%s）", len(high_priority_tasks), threshold)
 
         return high_priority_tasks
 
@@ -707,30 +1210,213 @@ class TaskCharacteristicRules:
         total_tasks = len(tasks)
 
         for task in tasks:
-            if hasattr(task, 'priority'):
-                priority = max(1, min(10, task.priority))
-            else:
-                priority = 5
+            priority = max(1, min(10, getattr(task, 'priority', 5)))
 
             priority_distribution[priority] += 1
 
-        print(f"\n{'=' * 60}")
-        print(f"任务优先级分布统计")
-        print(f"{'=' * 60}")
-        print(f"总任务数: {total_tasks}\n")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("任务优先级分布统计: 总任务数 %d", total_tasks)
 
-        # 按优先级排序显示
-        for priority in sorted(priority_distribution.keys()):
-            count = priority_distribution[priority]
-            percentage = (count / total_tasks) * 100 if total_tasks > 0 else 0
-            bar = '█' * int(percentage / 5)  # 每5%一个方块
-            print(f"  优先级{priority:2d}: {count:3d}个 ({percentage:5.1f}%) {bar}")
-
-        print(f"{'=' * 60}\n")
+            # 按优先级排序显示
+            for priority in sorted(priority_distribution.keys()):
+                count = priority_distribution[priority]
+                percentage = (count / total_tasks) * 100 if total_tasks > 0 else 0
+                bar = '█' * int(percentage / 5)  # 每5%一个方块
+                logger.info("优先级%2d: %3d个 (%5.1f%%) %s", priority, count, percentage, bar)
 
         return dict(priority_distribution)
 
 
+class OccupiedRegistry:
+    """
+    已占用阵位注册表
+
+    以连续的float64数组（结构数组）保存已占用阵位的弧度纬度、经度及单位向量，
+    增删阵位后派生数组在下次访问时重建，KDTree按需构建。
+    同时维护外扩惩罚距离后的经纬度包围盒，用于快速排除远离所有已占用阵位的候选。
+    可直接作为 resources['occupied_positions'] 传给阵位评分规则，在多次评分之间复用上述缓存；
+    阵位变化必须通过 add / remove 进行，不要直接修改 positions。
+    """
+
+    def __init__(self, positions_geo=()):
+        self.positions = [tuple(p) for p in positions_geo]
+        self._arrays = None
+        self._tree = None
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __iter__(self):
+        return iter(self.positions)
+
+    def add(self, position_geo):
+        """新增已占用阵位 (lon, lat, elev)"""
+        self.positions.append(tuple(position_geo))
+        self._arrays = None
+        self._tree = None
+
+    def remove(self, index):
+        """移除第 index 个已占用阵位，返回该阵位"""
+        position = self.positions.pop(index)
+        self._arrays = None
+        self._tree = None
+        return position
+
+    def _build(self):
+        if self._arrays is None:
+            coords = _as_point_array(self.positions)
+            lats, lons = np.radians(coords[:, 1]), np.radians(coords[:, 0])
+            self._arrays = (lats, lons, _unit_vectors(lats, lons),
+                            OccupiedRegistry._buffer_bbox(lats, _wrap_lon(lons), _OCCUPIED_BUFFER_M))
+        return self._arrays
+
+    @staticmethod
+    def _buffer_bbox(lats, lons, buffer_m):
+        """
+        计算外扩 buffer_m 后的包围盒 (lat_min, lat_max, lon_min, lon_max)（弧度）
+
+        纬度外扩 buffer_m / R；经度外扩 asin(sin(buffer_m / R) / cos(φmax))，其中φmax为外扩后
+        包围盒内的最大纬度绝对值，保证包围盒外的点到所有阵位的大圆距离均大于 buffer_m。
+        无阵位、包围盒触及极点或跨越±180°经线时返回None。
+        """
+        if not len(lats):
+            return None
+
+        dlat = buffer_m / _EARTH_RADIUS_M
+        lat_min, lat_max = float(lats.min()) - dlat, float(lats.max()) + dlat
+        cos_lat = math.cos(max(abs(lat_min), abs(lat_max)))
+        ratio = math.sin(dlat) / cos_lat if cos_lat > 0 else _INF
+        if ratio >= 1.0:
+            return None
+
+        dlon = math.asin(ratio)
+        lon_min, lon_max = float(lons.min()) - dlon, float(lons.max()) + dlon
+        if lon_min < -math.pi or lon_max > math.pi:
+            return None
+        return lat_min, lat_max, lon_min, lon_max
+
+    def outside_buffer(self, lats, lons):
+        """
+        判断阵位（弧度，标量或数组）是否位于外扩惩罚距离的包围盒之外
+
+        包围盒与候选经度均归一化到 [-π, π) 后比较，经度超出 ±180° 的坐标与 geopy 一致按等价经度处理。
+
+        Returns:
+            bool 或布尔数组: True表示到所有已占用阵位的距离均大于 _OCCUPIED_BUFFER_M；
+                             False表示需要进一步计算距离
+        """
+        bbox = self._build()[3]
+        if bbox is None:
+            return np.zeros(np.shape(lats), dtype=bool) if np.ndim(lats) else False
+        lat_min, lat_max, lon_min, lon_max = bbox
+        lons = _wrap_lon(lons)
+        return (lats < lat_min) | (lats > lat_max) | (lons < lon_min) | (lons > lon_max)
+
+    @property
+    def lats(self):
+        """纬度数组（弧度）"""
+        return self._build()[0]
+
+    @property
+    def lons(self):
+        """经度数组（弧度）"""
+        return self._build()[1]
+
+    @property
+    def xyz(self):
+        """单位向量数组，形状为 (N, 3)"""
+        return self._build()[2]
+
+    def tree(self):
+        """
+        地心直角坐标（米）上的KDTree；scipy不可用或阵位少于 _KDTREE_MIN_POINTS 时返回None
+
+        弦长与大圆距离单调对应，最近邻即球面最近阵位。
+        """
+        if cKDTree is None or len(self.positions) < _KDTREE_MIN_POINTS:
+            return None
+        if self._tree is None:
+            self._tree = cKDTree(self.xyz * _EARTH_RADIUS_M)
+        return self._tree
+
+
+class ThreatRegistry:
+    """
+    威胁注册表
+
+    以连续的float64数组保存威胁中心的弧度纬度、经度、单位向量及威胁半径，KDTree按需构建。
+    可直接作为 threats_geo 传给威胁安全检查规则，在多次检查之间复用上述缓存；
+    威胁变化必须通过 add / remove 进行，不要直接修改 threats。
+    """
+
+    def __init__(self, threats_geo=()):
+        self.threats = [tuple(t) for t in threats_geo]
+        self._arrays = None
+        self._tree = None
+
+    def __len__(self):
+        return len(self.threats)
+
+    def __iter__(self):
+        return iter(self.threats)
+
+    def add(self, threat_geo):
+        """新增威胁 (lon, lat, type, radius_m)"""
+        self.threats.append(tuple(threat_geo))
+        self._arrays = None
+        self._tree = None
+
+    def remove(self, index):
+        """移除第 index 个威胁，返回该威胁"""
+        threat = self.threats.pop(index)
+        self._arrays = None
+        self._tree = None
+        return threat
+
+    def _build(self):
+        if self._arrays is None:
+            coords = np.asarray([(t[1], t[0], t[3]) for t in self.threats],
+                                dtype=np.float64).reshape(-1, 3)
+            lats, lons = np.radians(coords[:, 0]), np.radians(coords[:, 1])
+            self._arrays = (lats, lons, _unit_vectors(lats, lons), coords[:, 2].copy())
+        return self._arrays
+
+    @property
+    def lats(self):
+        """纬度数组（弧度）"""
+        return self._build()[0]
+
+    @property
+    def lons(self):
+        """经度数组（弧度）"""
+        return self._build()[1]
+
+    @property
+    def xyz(self):
+        """单位向量数组，形状为 (N, 3)"""
+        return self._build()[2]
+
+    @property
+    def radii(self):
+        """威胁半径数组（米）"""
+        return self._build()[3]
+
+    @property
+    def max_radius(self):
+        """最大威胁半径（米），无威胁时为0"""
+        return float(self.radii.max()) if self.threats else 0.0
+
+    def tree(self):
+        """
+        威胁中心在地心直角坐标（米）上的KDTree；scipy不可用或威胁少于 _KDTREE_MIN_POINTS 时返回None
+        """
+        if cKDTree is None or len(self.threats) < _KDTREE_MIN_POINTS:
+            return None
+        if self._tree is None:
+            self._tree = cKDTree(self.xyz * _EARTH_RADIUS_M)
+        return self._tree
+
+
 class GeographicalConstraintRules:
     """地理约束规则"""
 
@@ -749,11 +1435,11 @@ class GeographicalConstraintRules:
         Returns:
             bool: True表示通视，False表示不通视
         """
-        try:
-            from base_functions import geo_to_pixel_3d, line_of_sight_3d
-        except ImportError:
-            print(f"    ❌ 缺少base_functions模块，无法进行通视检查")
+        funcs = _get_base_functions('geo_to_pixel_3d', 'line_of_sight_3d')
+        if funcs is None:
+            logger.warning("❌ 缺少base_functions模块，无法进行通视检查")
             return False
+        geo_to_pixel_3d, line_of_sight_3d = funcs
 
         pos_lon, pos_lat, pos_z = position_geo
 
@@ -776,12 +1462,12 @@ class GeographicalConstraintRules:
                 (tar_row, tar_col, tar_z)
             )
 
-            print(f"    通视检查: 阵位{(pos_lon, pos_lat)[:2]} -> 目标{(tar_lon, tar_lat)[:2]} "
-                  f"{'✓ 通视' if is_visible else '✗ 不通视'}")
+            logger.debug("通视检查: 阵位%s -> 目标%s %s", (pos_lon, pos_lat), (tar_lon, tar_lat),
+                         '✓ 通视' if is_visible else '✗ 不通视')
             return is_visible
 
         except Exception as e:
-            print(f"    ❌ 通视检查异常: {e}")
+            logger.warning("❌ 通视检查异常: %s", e)
             return False
 
     """2.飞行阵位选择规则"""
@@ -798,17 +1484,15 @@ class GeographicalConstraintRules:
             position_geo: 阵位坐标 (lon, lat, elev)
             target_geo: 目标坐标 (lon, lat) 或 (lon, lat, elev) 或区域中心
             resources: 资源字典，包含：
-                - occupied_positions: [(lon, lat, elev), ...] 已占用阵位列表
+                - occupied_positions: [(lon, lat, elev), ...] 已占用阵位列表或 OccupiedRegistry
                 - target_type: 'point' 或 'area'，默认'point'
                 - coverage: 覆盖率（区域目标专用，0.0-1.0）
 
         Returns:
             float: 评分值，越高越好。不通视返回float('-inf')
         """
-        try:
-            from geopy.distance import geodesic
-        except ImportError:
-            print(f"    ❌ 缺少geopy模块，无法计算距离")
+        if geodesic is None:
+            logger.warning("❌ 缺少geopy模块，无法计算距离")
             return float('-inf')
 
         pos_lon, pos_lat, pos_z = position_geo
@@ -821,49 +1505,175 @@ class GeographicalConstraintRules:
 
         # 1. 距离评分 - 距离越近评分越高
         distance_to_target = geodesic((pos_lat, pos_lon), (tar_lat, tar_lon)).meters
-
-        target_type = resources.get('target_type', 'point')
-        if target_type == 'area':
-            # 区域目标：包含覆盖率评分
-            coverage = resources.get('coverage', 0.0)
-            coverage_score = coverage * 10000  # 覆盖率基础分
-            distance_score = 50000 / (1 + distance_to_target)  # 距离评分
-            base_score = coverage_score + distance_score
-        else:
-            # 点目标：仅距离评分
-            distance_score = 100000 / (1 + distance_to_target)
-            base_score = distance_score
+        base_score = GeographicalConstraintRules._base_score(distance_to_target, resources)
 
         # 2. 阵位间距惩罚 - 距离已占用阵位越近惩罚越大
         position_penalty = 0
         occupied_positions = resources.get('occupied_positions', [])
 
         if occupied_positions:
-            min_distance_to_occupied = float('inf')
+            pos_lat_rad, pos_lon_rad = math.radians(pos_lat), math.radians(pos_lon)
+            # 少量阵位的普通列表不构建注册表，直接逐点近似计算
+            occupied = None
+            if isinstance(occupied_positions, OccupiedRegistry) or len(occupied_positions) > _EQUIRECT_MAX_POINTS:
+                occupied = _as_registry(occupied_positions, OccupiedRegistry)
+
+            # 包围盒快速排除：距所有已占用阵位均超过惩罚范围
+            if occupied is not None and occupied.outside_buffer(pos_lat_rad, pos_lon_rad):
+                logger.debug("最近已占用阵位距离超过%.0fm, 惩罚: 0", _OCCUPIED_BUFFER_M)
+            else:
+                if occupied is None:
+                    min_distance_to_occupied = GeographicalConstraintRules._min_equirect_distance(
+                        pos_lat_rad, pos_lon_rad, occupied_positions
+                    )
+                else:
+                    # 临时注册表只服务本次查询，单点查询不值得构建KDTree
+                    min_distance_to_occupied = GeographicalConstraintRules._min_occupied_distance(
+                        pos_lat_rad, pos_lon_rad, occupied, use_tree=occupied is occupied_positions
+                    )
+                position_penalty = _penalty_from_mindist(float(min_distance_to_occupied))
+
+                logger.debug("最近已占用阵位距离: %.0fm, 惩罚: %.0f",
+                             min_distance_to_occupied, position_penalty)
+
+        # 3. 总评分
+        total_score = base_score - position_penalty
 
-            for occupied_pos in occupied_positions:
-                occupied_lon, occupied_lat, _ = occupied_pos
-                dist_to_occupied = geodesic((pos_lat, pos_lon), (occupied_lat, occupied_lon)).meters
-                min_distance_to_occupied = min(min_distance_to_occupied, dist_to_occupied)
+        logger.debug("阵位评分: 距目标%.0fm, 基础分%.0f, 总分%.0f",
+                     distance_to_target, base_score, total_score)
 
-            # 20km范围内开始惩罚
-            if min_distance_to_occupied < 20000:
-                penalty_intensity = (20000 - min_distance_to_occupied) / 20000
-                position_penalty = penalty_intensity * 50000
+        return float(total_score)
 
-                # 5km范围内极重惩罚
-                if min_distance_to_occupied < 5000:
-                    position_penalty += 100000
+    @staticmethod
+    def score_positions(candidates_geo, target_geo, resources, exact=False):
+        """
+        批量阵位评分（向量化版本的 position_scoring）
 
-            print(f"      最近已占用阵位距离: {min_distance_to_occupied:.0f}m, 惩罚: {position_penalty:.0f}")
+        一次计算所有候选阵位的评分，评分规则与 position_scoring 相同；
+        距目标距离默认采用haversine球面距离，与 position_scoring 的椭球面距离相差约0.5%以内。
 
-        # 3. 总评分
-        total_score = base_score - position_penalty
+        Args:
+            candidates_geo: 候选阵位列表 [(lon, lat, elev), ...] 或形状为 (N, 2+) 的数组
+            target_geo: 目标坐标 (lon, lat) 或 (lon, lat, elev)
+            resources: 资源字典，同 position_scoring
+            exact: 为True且pyproj可用时，距目标距离采用WGS84椭球面距离，与 position_scoring 一致
 
-        print(f"    阵位评分: 距目标{distance_to_target:.0f}m, "
-              f"基础分{base_score:.0f}, 总分{total_score:.0f}")
+        Returns:
+            np.ndarray: 各候选阵位的评分
+        """
+        candidates = _as_point_array(candidates_geo)
+        cand_lat = np.radians(candidates[:, 1])
+        cand_lon = np.radians(candidates[:, 0])
+        cand_xyz = _unit_vectors(cand_lat, cand_lon)
+
+        # 1. 距离评分
+        if exact and GeographicalConstraintRules._geod_available():
+            distance_to_target = _geod_distance(
+                target_geo[0], target_geo[1], candidates[:, 0], candidates[:, 1]
+            )
+        else:
+            distance_to_target = _haversine_rad(
+                math.radians(target_geo[1]), math.radians(target_geo[0]), cand_lat, cand_lon
+            )
+        scores = GeographicalConstraintRules._base_score(distance_to_target, resources)
+
+        # 2. 阵位间距惩罚
+        if resources.get('occupied_positions'):
+            occupied = _as_registry(resources['occupied_positions'], OccupiedRegistry)
+            # 只对包围盒内（可能落入惩罚范围）的候选计算距离
+            near = ~occupied.outside_buffer(cand_lat, cand_lon)
+
+            if near.any():
+                near_xyz = cand_xyz[near]
+                occupied_tree = occupied.tree()
+
+                if occupied_tree is None:
+                    # 候选阵位与已占用阵位单位向量的点积矩阵，每行取最大点积即最近阵位；
+                    # 按 _SAFETY_BATCH_ROWS 行分块计算，限制矩阵内存占用
+                    max_dots = np.empty(len(near_xyz))
+                    for start in range(0, len(near_xyz), _SAFETY_BATCH_ROWS):
+                        block = near_xyz[start:start + _SAFETY_BATCH_ROWS]
+                        max_dots[start:start + len(block)] = (block @ occupied.xyz.T).max(axis=1)
+                    min_distance = _dot_to_distance(max_dots)
+                else:
+                    chord, _ = occupied_tree.query(near_xyz * _EARTH_RADIUS_M)
+                    min_distance = _chord_to_distance(chord)
+
+                scores = np.asarray(scores, dtype=np.float64)
+                scores[near] -= GeographicalConstraintRules._occupied_penalty(min_distance)
+
+        return scores
 
-        return float(total_score)
+    @staticmethod
+    def _geod_available():
+        """
+        检查pyproj是否可用（辅助方法），不可用时记录警告并由调用方改用球面距离
+        """
+        if _GEOD is None:
+            logger.warning("⚠️ 缺少pyproj模块，精确距离计算改用球面距离")
+            return False
+        return True
+
+    @staticmethod
+    def _base_score(distance_to_target, resources):
+        """
+        按距目标距离计算基础评分（辅助方法，支持标量或数组）
+        """
+        if resources.get('target_type', 'point') == 'area':
+            # 区域目标：覆盖率基础分 + 距离评分
+            coverage = resources.get('coverage', 0.0)
+            return coverage * 10000 + 50000 / (1 + distance_to_target)
+        # 点目标：仅距离评分
+        return 100000 / (1 + distance_to_target)
+
+    @staticmethod
+    def _occupied_penalty(min_distance):
+        """
+        按最近已占用阵位距离计算惩罚（辅助方法，支持标量或数组）
+
+        20km范围内开始线性惩罚，5km范围内额外极重惩罚。
+        """
+        d = np.asarray(min_distance, dtype=np.float64)
+        return (np.where(d < _OCCUPIED_BUFFER_M,
+                         (_OCCUPIED_BUFFER_M - d) / _OCCUPIED_BUFFER_M * _OCCUPIED_PENALTY, 0.0) +
+                np.where(d < _OCCUPIED_CRITICAL_M, _OCCUPIED_CRITICAL_PENALTY, 0.0))
+
+    @staticmethod
+    def _min_occupied_distance(lat, lon, occupied, use_tree=True):
+        """
+        计算阵位 (lat, lon)（弧度）到最近已占用阵位的大圆距离（米）（辅助方法）
+
+        依次选用：KDTree最近邻查询（use_tree为True时）、numba编译的haversine循环、单位向量点积。
+
+        Args:
+            occupied: OccupiedRegistry
+        """
+        occupied_tree = occupied.tree() if use_tree else None
+        if occupied_tree is not None:
+            chord, _ = occupied_tree.query(_unit_vectors(lat, lon) * _EARTH_RADIUS_M)
+            return float(_chord_to_distance(chord))
+
+        if _min_haversine_rad is not None:
+            return _min_haversine_rad(lat, lon, occupied.lats, occupied.lons)
+
+        # 距离随点积单调递减，取最大点积后只做一次距离换算
+        return float(_dot_to_distance((occupied.xyz @ _unit_vectors(lat, lon)).max()))
+
+    @staticmethod
+    def _min_equirect_distance(lat, lon, occupied_positions):
+        """
+        等距圆柱近似计算阵位 (lat, lon)（弧度）到最近已占用阵位的距离（米）（辅助方法）
+
+        dx = R·cos(lat)·Δlon，dy = R·Δlat，d = hypot(dx, dy)；适用于惩罚带（20km）量级的近距离。
+        """
+        cos_lat = math.cos(lat)
+        min_d = _INF
+        for occ_lon, occ_lat, _ in occupied_positions:
+            dlon = _wrap_lon(math.radians(occ_lon) - lon)
+            d = math.hypot(cos_lat * dlon, math.radians(occ_lat) - lat)
+            if d < min_d:
+                min_d = d
+        return _EARTH_RADIUS_M * min_d
 
     """3.安全阵位判断"""
     @staticmethod
@@ -872,103 +1682,199 @@ class GeographicalConstraintRules:
         威胁安全距离检查（硬约束）
 
         Args:
-            position_geo: 阵位坐标 (lon, lat, elev)
-            threats_geo: 威胁列表 [(lon, lat, type, radius_m), ...]
+            position_geo: 阵位坐标 (lon, lat, elev)；传入形状为 (N, 2+) 的数组时按批量检查
+            threats_geo: 威胁列表 [(lon, lat, type, radius_m), ...] 或 ThreatRegistry
             safety_buffer_m: 安全缓冲距离，默认5000米
 
         Returns:
-            bool: True表示安全，False表示太接近威胁
+            bool: True表示安全，False表示太接近威胁；批量检查时返回布尔数组，见 is_safe_batch
         """
-        try:
-            from base_functions import is_safe_from_threats
-        except ImportError:
-            print(f"    ❌ 缺少base_functions模块，无法进行威胁安全检查")
+        if isinstance(position_geo, np.ndarray) and position_geo.ndim == 2:
+            return GeographicalConstraintRules.is_safe_batch(position_geo, threats_geo, safety_buffer_m)
+
+        funcs = _get_base_functions('is_safe_from_threats')
+        if funcs is None:
+            logger.warning("❌ 缺少base_functions模块，无法进行威胁安全检查")
             return False
+        is_safe_from_threats, = funcs
+
+        # 传入 ThreatRegistry 且威胁较多时，先用KDTree筛出可能过近的威胁，只对候选做精确检查；
+        # 普通列表直接交给 is_safe_from_threats
+        threat_list = threats_geo
+        if isinstance(threats_geo, ThreatRegistry):
+            threat_list = threats_geo.threats
+            threat_tree = threats_geo.tree()
+            if threat_tree is not None:
+                candidates = threat_tree.query_ball_point(
+                    _unit_vectors(math.radians(position_geo[1]), math.radians(position_geo[0]))
+                    * _EARTH_RADIUS_M,
+                    r=_distance_to_chord((threats_geo.max_radius + safety_buffer_m) * _SPHERE_MARGIN)
+                )
+                threat_list = [threat_list[i] for i in candidates]
 
-        is_safe = is_safe_from_threats(position_geo, threats_geo, safety_buffer_m)
+        is_safe = not threat_list or is_safe_from_threats(position_geo, threat_list, safety_buffer_m)
 
         if not is_safe:
-            print(f"    ❌ 威胁安全检查: 阵位{position_geo[:2]} 距离威胁过近")
+            logger.debug("❌ 威胁安全检查: 阵位%s 距离威胁过近", position_geo[:2])
         else:
-            print(f"    ✓ 威胁安全检查: 阵位{position_geo[:2]} 安全")
+            logger.debug("✓ 威胁安全检查: 阵位%s 安全", position_geo[:2])
 
         return is_safe
 
+    @staticmethod
+    def is_safe_batch(candidates_geo, threats_geo, safety_buffer_m=5000, exact=False):
+        """
+        批量威胁安全距离检查
+
+        候选阵位与威胁中心的单位向量点积矩阵分块计算（每块 _SAFETY_BATCH_ROWS 个候选），
+        与各威胁的安全距离阈值（半径 + 缓冲）对应的余弦值比较，不计算反三角函数。
+        球面距离与椭球面距离最多相差约0.5%，因此阈值按 _SPHERE_MARGIN 放大/缩小得到两条边界：
+        缩小阈值内判为不安全，放大阈值外判为安全，两者之间的边界带在pyproj可用时按椭球面距离精确判定，
+        否则保守地判为不安全。
+
+        Args:
+            candidates_geo: 候选阵位列表 [(lon, lat, elev), ...] 或形状为 (N, 2+) 的数组
+            threats_geo: 威胁列表 [(lon, lat, type, radius_m), ...] 或 ThreatRegistry
+            safety_buffer_m: 安全缓冲距离，默认5000米
+            exact: 为True且pyproj可用时，逐对计算WGS84椭球面距离（较慢）
+
+        Returns:
+            np.ndarray: 布尔数组，True表示安全
+        """
+        candidates = _as_point_array(candidates_geo)
+        safe = np.ones(len(candidates), dtype=bool)
+        if not len(threats_geo) or not len(candidates):
+            return safe
+
+        threats = _as_registry(threats_geo, ThreatRegistry)
+
+        if exact and GeographicalConstraintRules._geod_available():
+            threat_lons, threat_lats = np.degrees(threats.lons), np.degrees(threats.lats)
+            limits = threats.radii + safety_buffer_m
+            for start in range(0, len(candidates), _SAFETY_BATCH_ROWS):
+                block = candidates[start:start + _SAFETY_BATCH_ROWS]
+                distance = _geod_distance(block[:, 0, None], block[:, 1, None], threat_lons, threat_lats)
+                safe[start:start + len(block)] = ~(distance < limits).any(axis=1)
+            return safe
+
+        threat_xyz = threats.xyz
+        limits = threats.radii + safety_buffer_m
+        # 距离 < 阈值  <=>  点积 > cos(阈值 / R)
+        inner_dots = np.cos(np.minimum(limits / _SPHERE_MARGIN / _EARTH_RADIUS_M, np.pi))
+        outer_dots = np.cos(np.minimum(limits * _SPHERE_MARGIN / _EARTH_RADIUS_M, np.pi))
+
+        for start in range(0, len(candidates), _SAFETY_BATCH_ROWS):
+            block = candidates[start:start + _SAFETY_BATCH_ROWS]
+            cand_xyz = _unit_vectors(np.radians(block[:, 1]), np.radians(block[:, 0]))
+            dots = cand_xyz @ threat_xyz.T
+            unsafe = (dots > inner_dots).any(axis=1)
+
+            # 边界带内的候选-威胁对：球面模型无法确定，精确判定或保守处理
+            band = (dots > outer_dots) & ~unsafe[:, None]
+            rows, cols = np.nonzero(band)
+            if len(rows):
+                if _GEOD is not None:
+                    distance = _geod_distance(block[rows, 0], block[rows, 1],
+                                              np.degrees(threats.lons[cols]), np.degrees(threats.lats[cols]))
+                    rows = rows[distance < limits[cols]]
+                unsafe[rows] = True
+
+            safe[start:start + len(block)] = ~unsafe
+
+        return safe
+
 
 class EfficiencyOptimizationRules:
     """效率优化规则"""
 
     @staticmethod
-    def total_distance_minimization(solution: Any):
+    def compute_efficiency_metrics(solution: Any):
         """
-        总距离最小化（最短距离）
+        一次遍历同时计算总距离与最大完成时间
+
+        每架无人机的航线只计算一次，结果同时写入
+        solution.metrics["total_distance"] 与 solution.metrics["completion_time"]。
+
+        Returns:
+            tuple: (total_distance, max_completion_time)
         """
         total_distance = 0
-        
+        max_completion_time = 0
+
+        metrics = getattr(solution, 'metrics', None)
+        if metrics is None:
+            solution.metrics = metrics = {}
+
         # 检查必要的属性
-        if not hasattr(solution, 'assignments'):
-            print(f"    ❌ Solution对象缺少assignments属性")
-            solution.metrics["total_distance"] = 0
-            return
-            
-        for drone_key, task_ids in solution.assignments.items():
-            if not task_ids:
-                continue
-                
+        assignments = getattr(solution, 'assignments', None)
+        if assignments is None:
+            logger.warning("❌ Solution对象缺少assignments属性")
+            metrics["total_distance"] = 0
+            metrics["completion_time"] = 0
+            return total_distance, max_completion_time
+
+        SolutionChecker = _get_solution_checker()
+        if SolutionChecker is None:
+            logger.warning("❌ 缺少SolutionChecker模块，无法计算航线")
+            metrics["total_distance"] = 0
+            metrics["completion_time"] = 0
+            return total_distance, max_completion_time
+
+        checker = SolutionChecker()
+        # 跳过未分配任务的无人机
+        active_routes = [(drone_key, task_ids) for drone_key, task_ids in assignments.items() if task_ids]
+        for drone_key, task_ids in active_routes:
             try:
-                # 导入必要的模块
-                from solution_checker import SolutionChecker
-                checker = SolutionChecker()
-                
                 # 计算使用的航程和完成时间（基于最优起飞时间）
-                final_location, final_time, total_range = checker.calculate_complete_route(
-                    solution, drone_key, task_ids
-                )
+                final_location, final_time, total_range = \
+                    EfficiencyOptimizationRules._complete_route(checker, solution, drone_key, task_ids)
                 total_distance += total_range
+                max_completion_time = max(max_completion_time, final_time)
             except Exception as e:
-                print(f"    ⚠️  计算无人机{drone_key}航程失败: {e}")
+                logger.warning("⚠️ 计算无人机%s航线失败: %s", drone_key, e)
                 continue
-                
-        if not hasattr(solution, 'metrics'):
-            solution.metrics = {}
-        solution.metrics["total_distance"] = total_distance
 
+        metrics["total_distance"] = total_distance
+        # 设置最大完成时间
+        metrics["completion_time"] = max_completion_time
+        return total_distance, max_completion_time
+
+    @staticmethod
+    def total_distance_minimization(solution: Any):
+        """
+        总距离最小化（最短距离）
+        """
+        EfficiencyOptimizationRules.compute_efficiency_metrics(solution)
 
     @staticmethod
     def completion_time_minimization(solution: Any):
         """
         最大完成时间最小化(最短时间)
         """
-        max_completion_time = 0
-        
-        # 检查必要的属性
-        if not hasattr(solution, 'assignments'):
-            print(f"    ❌ Solution对象缺少assignments属性")
-            if hasattr(solution, 'metrics'):
-                solution.metrics["completion_time"] = 0
-            else:
-                solution.metrics = {"completion_time": 0}
-            return
-            
-        for drone_key, task_ids in solution.assignments.items():
-            if not task_ids:
-                continue
-                
-            try:
-                # 导入必要的模块
-                from solution_checker import SolutionChecker
-                checker = SolutionChecker()
-                
-                # 计算使用的航程和完成时间（基于最优起飞时间）
-                final_location, final_time, total_range = checker.calculate_complete_route(
-                    solution, drone_key, task_ids
-                )
-                max_completion_time = max(max_completion_time, final_time)
-            except Exception as e:
-                print(f"    ⚠️  计算无人机{drone_key}完成时间失败: {e}")
-                continue
-                
-        if not hasattr(solution, 'metrics'):
-            solution.metrics = {}
-        # 设置最大完成时间
-        solution.metrics["completion_time"] = max_completion_time
\ No newline at end of file
+        EfficiencyOptimizationRules.compute_efficiency_metrics(solution)
+
+    @staticmethod
+    def _complete_route(checker, solution: Any, drone_key: str, task_ids: List[int]):
+        """
+        计算无人机完整航线，带缓存（辅助方法）
+
+        solution 具有 version 属性（每次修改后递增）时，结果缓存在 solution._route_cache 中，
+        以 (drone_key, tuple(task_ids)) 为键；version 变化后整个缓存失效。
+        没有 version 属性时不缓存，直接调用 checker.calculate_complete_route。
+
+        Returns:
+            tuple: (final_location, final_time, total_range)
+        """
+        version = getattr(solution, 'version', None)
+        if version is None:
+            return checker.calculate_complete_route(solution, drone_key, task_ids)
+
+        cache = getattr(solution, '_route_cache', None)
+        if cache is None or cache[0] != version:
+            cache = solution._route_cache = (version, {})
+
+        key = (drone_key, tuple(task_ids))
+        routes = cache[1]
+        if key not in routes:
+            routes[key] = checker.calculate_complete_route(solution, drone_key, task_ids)
+        return routes[key]
\ No newline at end of file
@@ -0,0 +1,105 @@
+"""drone_scheduling_rules 规则库回归测试"""
+import importlib.machinery
+import importlib.util
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+RULES_PATH = Path(__file__).resolve().parents[1] / 'src' / 'drone_scheduling_rules' / 'rules.py.py'
+
+
+@pytest.fixture(scope='module')
+def rules():
+    """按文件路径加载 rules.py.py（文件名含双后缀，无法直接 import）"""
+    loader = importlib.machinery.SourceFileLoader('drone_scheduling_rules_rules', str(RULES_PATH))
+    spec = importlib.util.spec_from_loader(loader.name, loader)
+    module = importlib.util.module_from_spec(spec)
+    # numba 编译缓存按模块名回查全局变量，需注册到 sys.modules
+    sys.modules[loader.name] = module
+    loader.exec_module(module)
+    return module
+
+
+def test_payload_capacity_follows_reassigned_requirements(rules):
+    """重新赋值 task.required_payloads 后，载荷约束按新需求检查"""
+    drone = SimpleNamespace(payload_capability={2: (10, 1)})
+    task = SimpleNamespace(required_payloads={2: (1, 1)})
+
+    assert rules.AircraftCapabilityRules.payload_capacity(drone, task, {})
+
+    task.required_payloads = {3: (1, 1)}
+    assert not rules.AircraftCapabilityRules.payload_capacity(drone, task, {})
+
+
+def _airport_solution():
+    """构造一个机场 1（总数上限 1）及两架同型无人机的分配方案"""
+    solution = SimpleNamespace(
+        assignments={'1_a': [], '1_b': []},
+        drone_info={'1_a': {'type': 1}, '1_b': {'type': 1}},
+    )
+    airports = {1: SimpleNamespace(total_limits=1, type_limits={1: 2}),
+                '1': SimpleNamespace(total_limits=1, type_limits={1: 2})}
+    return solution, airports
+
+
+@pytest.mark.parametrize('airport_id', [1, '1'])
+def test_airport_counters_accept_int_and_digit_string_ids(rules, airport_id):
+    """整数与数字字符串机场ID共用同一组计数器"""
+    solution, airports = _airport_solution()
+    rules.AirportCapabilityRules.update_drone_assignment(solution, 1, '1_a', [10])
+
+    assert not rules.AirportCapabilityRules._check_airport_constraints(
+        solution, airport_id, 1, airports, '1_b')
+
+    rules.AirportCapabilityRules.update_drone_assignment(solution, '1', '1_a', [])
+    assert rules.AirportCapabilityRules._check_airport_constraints(
+        solution, airport_id, 1, airports, '1_b')
+
+
+def test_update_drone_assignment_copies_task_ids(rules):
+    """原地修改传入的任务列表不会使计数器与分配表失步"""
+    solution, airports = _airport_solution()
+    task_ids = []
+    rules.AirportCapabilityRules.update_drone_assignment(solution, 1, '1_a', task_ids)
+    task_ids.append(10)
+
+    assert solution.assignments['1_a'] == []
+    assert rules.AirportCapabilityRules._check_airport_constraints(solution, 1, 1, airports, '1_b')
+
+    task_ids = [10]
+    rules.AirportCapabilityRules.update_drone_assignment(solution, 1, '1_a', task_ids)
+    task_ids.clear()
+
+    assert solution.assignments['1_a'] == [10]
+    assert not rules.AirportCapabilityRules._check_airport_constraints(solution, 1, 1, airports, '1_b')
+
+
+def test_sort_tasks_by_weight_follows_priority_change(rules):
+    """修改任务优先级后，小规模排序与批量排序路径给出相同的新顺序"""
+    tasks = [SimpleNamespace(id=i, priority=5, duration=0, bandwidth=0,
+                             required_payloads={}, required_types=(1,)) for i in range(10)]
+    rules.TaskCharacteristicRules.sort_tasks_by_weight(tasks)
+
+    tasks[7].priority = 1
+    assert rules.TaskCharacteristicRules.sort_tasks_by_weight(tasks)[0] is tasks[7]
+
+    many = tasks * (rules._BATCH_SORT_THRESHOLD // len(tasks))
+    assert rules.TaskCharacteristicRules.sort_tasks_by_weight(many)[0] is tasks[7]
+
+
+def test_runway_capacity_with_zero_takeoff_duration(rules):
+    """起飞占用时长为0时，重叠计数与逐条扫描一致且不为负"""
+    resources = {'runway_counts': {1: 1}, 'takeoff_duration': 0.0}
+    rules.AirportCapabilityRules.update_runway_occupancy(1, 3.0, 0.0, 'a', 'takeoff', resources)
+    rules.AirportCapabilityRules.update_runway_occupancy(1, 1.0, 4.0, 'b', 'landing', resources)
+    starts, ends, records = rules.AirportCapabilityRules._get_runway_index(1, resources)
+
+    assert rules.AirportCapabilityRules._count_overlaps(starts, ends, 3.0, 3.0, records) == 1
+    assert rules.AirportCapabilityRules._count_overlaps(starts, ends, 6.0, 6.0, records) == 0
+    assert list(rules.AirportCapabilityRules.runway_overlap_counts(1, [3.0, 6.0], [3.0, 6.0], resources)) == [1, 0]
+
+    drone = SimpleNamespace(id='c', airport=SimpleNamespace(id=1))
+    assert not rules.AirportCapabilityRules.takeoff_runway_capacity(drone, None, 3.0, resources)
+    assert rules.AirportCapabilityRules.takeoff_runway_capacity(drone, None, 6.0, resources)